@@ -12,22 +12,34 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
+import argparse
 import warnings
 warnings.filterwarnings('ignore')
 
-def load_and_explore_data():
-    """Load the penguins dataset and perform initial exploration."""
+from penguins_common import NUMERICAL_COLS, correlation_matrix, load_penguins
+
+# zlib level 1 instead of the default 6: much faster to write, slightly larger files
+SAVEFIG_KWARGS = {'dpi': 150, 'bbox_inches': 'tight', 'pil_kwargs': {'compress_level': 1}}
+
+def load_and_explore_data(verbose=False):
+    """Load the penguins dataset and perform initial exploration.
+
+    With verbose=True, also print df.info() and the deep memory usage.
+    """
     print("=== PALMER PENGUINS DATASET ANALYSIS ===\n")
     
     # Load dataset
-    df = pd.read_csv('penguins.csv')
+    df = load_penguins()
     print(f"Dataset loaded: {df.shape[0]} observations, {df.shape[1]} variables\n")
     
     # Basic info
     print("=== DATASET STRUCTURE ===")
-    print(df.info())
-    print(f"\nDataset shape: {df.shape}")
-    print(f"Memory usage: {df.memory_usage(deep=True).sum() / 1024:.1f} KB")
+    if verbose:
+        df.info()
+        print()
+    print(f"Dataset shape: {df.shape}")
+    if verbose:
+        print(f"Memory usage: {df.memory_usage(deep=True).sum() / 1024:.1f} KB")
     
     # Missing values
     print("\n=== MISSING VALUES ===")
@@ -76,63 +88,60 @@ def analyze_categorical_variables(df):
     print(crosstab)
 
 def calculate_correlations(df):
-    """Calculate and display correlations between numerical variables."""
+    """Calculate, display and return correlations between numerical variables."""
     print("\n=== CORRELATION ANALYSIS ===")
     
-    numerical_cols = ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']
-    corr_matrix = df[numerical_cols].corr()
+    corr_matrix = correlation_matrix(df)
     print("Correlation matrix:")
     print(corr_matrix.round(3))
     
     # Find strongest correlations
     corr_pairs = []
-    for i in range(len(numerical_cols)):
-        for j in range(i+1, len(numerical_cols)):
+    for i in range(len(NUMERICAL_COLS)):
+        for j in range(i+1, len(NUMERICAL_COLS)):
             corr_val = corr_matrix.iloc[i, j]
-            corr_pairs.append((numerical_cols[i], numerical_cols[j], corr_val))
+            corr_pairs.append((NUMERICAL_COLS[i], NUMERICAL_COLS[j], corr_val))
     
     corr_pairs.sort(key=lambda x: abs(x[2]), reverse=True)
     print("\nStrongest correlations:")
     for var1, var2, corr in corr_pairs:
         print(f"{var1} <-> {var2}: {corr:.3f}")
+    
+    return corr_matrix
 
-def analyze_by_species(df):
-    """Analyze measurements by species."""
+def analyze_by_species(species_gb):
+    """Analyze measurements by species from a species groupby."""
     print("\n=== ANALYSIS BY SPECIES ===")
     
-    numerical_cols = ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']
-    
-    species_stats = df.groupby('species')[numerical_cols].agg(['mean', 'std', 'min', 'max'])
+    species_stats = species_gb[NUMERICAL_COLS].agg(['mean', 'std', 'min', 'max'])
     print("Summary statistics by species:")
     print(species_stats.round(1))
 
-def analyze_sexual_dimorphism(df):
-    """Analyze sexual dimorphism patterns."""
+def analyze_sexual_dimorphism(df_sex):
+    """Analyze sexual dimorphism patterns (rows with known sex only)."""
     print("\n=== SEXUAL DIMORPHISM ANALYSIS ===")
     
-    # Remove rows with missing sex
-    df_sex = df.dropna(subset=['sex'])
-    
-    numerical_cols = ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']
-    
-    sex_stats = df_sex.groupby('sex')[numerical_cols].agg(['mean', 'std']).round(1)
+    sex_stats = df_sex.groupby('sex', observed=True)[NUMERICAL_COLS].agg(['mean', 'std']).round(1)
     print("Summary statistics by sex:")
     print(sex_stats)
     
     # Statistical significance tests
     print("\nStatistical tests for sexual dimorphism (t-tests):")
-    males = df_sex[df_sex['sex'] == 'MALE']
-    females = df_sex[df_sex['sex'] == 'FEMALE']
-    
-    for col in numerical_cols:
-        male_vals = males[col].dropna()
-        female_vals = females[col].dropna()
-        
-        if len(male_vals) > 0 and len(female_vals) > 0:
-            t_stat, p_val = stats.ttest_ind(male_vals, female_vals)
+    male_vals = df_sex.loc[df_sex['sex'] == 'MALE', NUMERICAL_COLS].to_numpy()
+    female_vals = df_sex.loc[df_sex['sex'] == 'FEMALE', NUMERICAL_COLS].to_numpy()
+    
+    # Only columns with values for both sexes are tested, as before. They go
+    # through one ttest_ind call; NaNs are dropped per column (with NaNs
+    # present SciPy still loops over the columns internally)
+    testable = ~np.isnan(male_vals).all(axis=0) & ~np.isnan(female_vals).all(axis=0)
+    if testable.any():
+        t_stats, p_vals = stats.ttest_ind(male_vals[:, testable], female_vals[:, testable],
+                                          axis=0, nan_policy='omit')
+        tested_cols = [col for col, ok in zip(NUMERICAL_COLS, testable) if ok]
+        for col, t_stat, p_val in zip(tested_cols, t_stats, p_vals):
             print(f"{col}: t={t_stat:.3f}, p={p_val:.6f}")
 
-def create_visualizations(df):
+def create_visualizations(df, df_sex, corr_matrix, species_gb):
     """Generate comprehensive visualizations."""
     print("\n=== GENERATING VISUALIZATIONS ===")
     
@@ -140,66 +149,75 @@ def create_visualizations(df):
     plt.style.use('default')
     sns.set_palette("husl")
     
-    # Figure 1: Species comparison boxplots
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-    fig.suptitle('Physical Measurements by Penguin Species', fontsize=16, y=0.98)
-    
-    numerical_cols = ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']
-    titles = ['Bill Length (mm)', 'Bill Depth (mm)', 'Flipper Length (mm)', 'Body Mass (g)']
-    
-    for i, (col, title) in enumerate(zip(numerical_cols, titles)):
-        ax = axes[i//2, i%2]
-        sns.boxplot(data=df, x='species', y=col, ax=ax)
-        ax.set_title(title)
-        ax.set_xlabel('Species')
-        ax.tick_params(axis='x', rotation=45)
-    
-    plt.tight_layout()
-    plt.savefig('penguins_species_comparison.png', dpi=150, bbox_inches='tight')
-    plt.close()
-    
-    # Figure 2: Correlation heatmap
-    fig, ax = plt.subplots(figsize=(8, 6))
-    corr_matrix = df[numerical_cols].corr()
-    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
-                square=True, ax=ax, fmt='.3f')
-    ax.set_title('Correlation Matrix of Physical Measurements')
-    plt.tight_layout()
-    plt.savefig('penguins_correlation_matrix.png', dpi=150, bbox_inches='tight')
-    plt.close()
-    
-    # Figure 3: Flipper length vs Body mass scatter plot
-    fig, ax = plt.subplots(figsize=(10, 6))
-    for species in df['species'].unique():
-        species_data = df[df['species'] == species]
-        ax.scatter(species_data['flipper_length_mm'], species_data['body_mass_g'], 
-                  label=species, alpha=0.7, s=50)
-    
-    ax.set_xlabel('Flipper Length (mm)')
-    ax.set_ylabel('Body Mass (g)')
-    ax.set_title('Flipper Length vs Body Mass by Species')
-    ax.legend()
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('penguins_flipper_mass_scatter.png', dpi=150, bbox_inches='tight')
-    plt.close()
-    
-    # Figure 4: Sexual dimorphism analysis
-    df_clean = df.dropna(subset=['sex'])
-    if not df_clean.empty:
-        fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-        fig.suptitle('Sexual Dimorphism in Penguin Species', fontsize=16, y=0.98)
+    # Every figure opened below is closed in the finally block, even if
+    # drawing or saving fails partway.
+    figures = []
+    try:
+        # Figure 1: Species comparison boxplots
+        # The 2x2 grid is kept open and redrawn for Figure 4 instead of
+        # allocating a second figure.
+        grid_fig, grid_axes = plt.subplots(2, 2, figsize=(12, 10))
+        figures.append(grid_fig)
+        grid_fig.suptitle('Physical Measurements by Penguin Species', fontsize=16, y=0.98)
         
-        for i, (col, title) in enumerate(zip(numerical_cols, titles)):
-            ax = axes[i//2, i%2]
-            sns.violinplot(data=df_clean, x='species', y=col, hue='sex', ax=ax)
+        titles = ['Bill Length (mm)', 'Bill Depth (mm)', 'Flipper Length (mm)', 'Body Mass (g)']
+        
+        for i, (col, title) in enumerate(zip(NUMERICAL_COLS, titles)):
+            ax = grid_axes[i//2, i%2]
+            sns.boxplot(data=df, x='species', y=col, ax=ax)
             ax.set_title(title)
             ax.set_xlabel('Species')
             ax.tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
-        plt.savefig('penguins_sexual_dimorphism.png', dpi=150, bbox_inches='tight')
-        plt.close()
+        grid_fig.tight_layout()
+        grid_fig.savefig('penguins_species_comparison.png', **SAVEFIG_KWARGS)
+        for ax in grid_axes.ravel():
+            ax.clear()
+        
+        # Figure 2: Correlation heatmap
+        fig, ax = plt.subplots(figsize=(8, 6))
+        figures.append(fig)
+        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, 
+                    square=True, ax=ax, fmt='.3f')
+        ax.set_title('Correlation Matrix of Physical Measurements')
+        fig.tight_layout()
+        fig.savefig('penguins_correlation_matrix.png', **SAVEFIG_KWARGS)
+        
+        # Figure 3: Flipper length vs Body mass scatter plot
+        fig, ax = plt.subplots(figsize=(10, 6))
+        figures.append(fig)
+        for species, species_data in species_gb:
+            ax.scatter(species_data['flipper_length_mm'], species_data['body_mass_g'], 
+                      label=species, alpha=0.7, s=50)
+        
+        ax.set_xlabel('Flipper Length (mm)')
+        ax.set_ylabel('Body Mass (g)')
+        ax.set_title('Flipper Length vs Body Mass by Species')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        fig.savefig('penguins_flipper_mass_scatter.png', **SAVEFIG_KWARGS)
+        
+        # Figure 4: Sexual dimorphism analysis
+        # Hue is passed as plain strings: seaborn looks up each species/sex
+        # violin with a multi-key categorical groupby, which pairs the legend
+        # labels with the wrong violins on recent pandas.
+        df_clean = df_sex.astype({'sex': str})
+        if not df_clean.empty:
+            grid_fig.suptitle('Sexual Dimorphism in Penguin Species', fontsize=16, y=0.98)
+            
+            for i, (col, title) in enumerate(zip(NUMERICAL_COLS, titles)):
+                ax = grid_axes[i//2, i%2]
+                sns.violinplot(data=df_clean, x='species', y=col, hue='sex', ax=ax)
+                ax.set_title(title)
+                ax.set_xlabel('Species')
+                ax.tick_params(axis='x', rotation=45)
+            
+            grid_fig.tight_layout()
+            grid_fig.savefig('penguins_sexual_dimorphism.png', **SAVEFIG_KWARGS)
+    finally:
+        for fig in figures:
+            plt.close(fig)
     
     print("Visualizations saved:")
     print("- penguins_species_comparison.png")
@@ -211,42 +229,48 @@ def identify_outliers(df):
     """Identify potential outliers in the dataset."""
     print("\n=== OUTLIER ANALYSIS ===")
     
-    numerical_cols = ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']
-    
-    for col in numerical_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
+    # IQR bounds and outlier mask for all columns at once
+    measurements = df[NUMERICAL_COLS]
+    quartiles = measurements.quantile([0.25, 0.75])
+    Q1, Q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+    IQR = Q3 - Q1
+    lower_bound = Q1 - 1.5 * IQR
+    upper_bound = Q3 + 1.5 * IQR
+    outlier_mask = measurements.lt(lower_bound) | measurements.gt(upper_bound)
+    
+    for col in NUMERICAL_COLS:
+        outliers = df[outlier_mask[col]]
         if not outliers.empty:
             print(f"\n{col} outliers ({len(outliers)} found):")
             print(outliers[['species', 'island', 'sex', col]].to_string())
 
-def main():
+def main(verbose=False):
     """Main analysis function."""
     # Load and explore data
-    df = load_and_explore_data()
+    df = load_and_explore_data(verbose=verbose)
+    
+    # Rows with known sex and the species grouping, shared by the
+    # analyses and plots below
+    df_sex = df.dropna(subset=['sex'])
+    species_gb = df.groupby('species', sort=False, observed=True)
     
     # Analyze categorical variables
     analyze_categorical_variables(df)
     
     # Calculate correlations
-    calculate_correlations(df)
+    corr_matrix = calculate_correlations(df)
     
     # Analyze by species
-    analyze_by_species(df)
+    analyze_by_species(species_gb)
     
     # Analyze sexual dimorphism
-    analyze_sexual_dimorphism(df)
+    analyze_sexual_dimorphism(df_sex)
     
     # Identify outliers
     identify_outliers(df)
     
     # Create visualizations
-    create_visualizations(df)
+    create_visualizations(df, df_sex, corr_matrix, species_gb)
     
     print("\n=== ANALYSIS COMPLETE ===")
     print("Key findings:")
@@ -257,4 +281,8 @@ def main():
     print("5. Dataset quality is high with minimal missing data")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Palmer Penguins dataset analysis")
+    parser.add_argument('--verbose', action='store_true',
+                        help="also print df.info() and the deep memory usage")
+    args = parser.parse_args()
+    main(verbose=args.verbose)
\ No newline at end of file
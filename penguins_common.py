@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Palmer Penguins - Shared Data Loading
+=====================================
+
+Column definitions and the typed dataset loader shared by
+penguins_analysis.py and penguins_eda.py, so both scripts parse
+penguins.csv the same way.
+"""
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = 'penguins.csv'
+
+NUMERICAL_COLS = ['bill_length_mm', 'bill_depth_mm', 'flipper_length_mm', 'body_mass_g']
+CATEGORICAL_COLS = ['species', 'island', 'sex']
+
+# Explicit read_csv dtypes, so the known columns skip type inference; any
+# other column still loads as usual. Measurements stay float64: float32
+# visibly changes the printed statistics.
+DTYPES = {
+    **{col: 'category' for col in CATEGORICAL_COLS},
+    **{col: np.float64 for col in NUMERICAL_COLS},
+}
+
+
+def load_penguins(path=DATA_PATH):
+    """Load the penguins dataset with the shared column dtypes."""
+    return pd.read_csv(path, dtype=DTYPES)
+
+
+def correlation_matrix(df, columns=NUMERICAL_COLS):
+    """Pearson correlation matrix of the given numerical columns."""
+    columns = list(columns)
+    values = df[columns]
+    null_mask = values.isna().to_numpy()
+    complete = ~null_mask[:, 0]
+    # Dropping incomplete rows once only matches DataFrame.corr's
+    # pairwise-complete result when every column is missing on the same
+    # rows; otherwise (or with too few rows) defer to DataFrame.corr
+    if not (null_mask == null_mask[:, :1]).all() or complete.sum() < 2:
+        return values.corr()
+    # Single matmul of the standardized block with itself
+    arr = values.to_numpy(dtype=np.float64)[complete]
+    z = (arr - arr.mean(axis=0)) / arr.std(axis=0, ddof=1)
+    corr = np.clip(z.T @ z / (len(z) - 1), -1.0, 1.0)
+    return pd.DataFrame(corr, index=columns, columns=columns)
@@ -12,15 +12,54 @@ Variables: Species, island, bill measurements, flipper length, body mass, sex, y
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import atexit
+import functools
+import io
+import sys
 from datetime import datetime
 
+from penguins_common import correlation_matrix, load_penguins
+
 # Set display options for better output
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', None)
 pd.set_option('display.max_colwidth', None)
 
+# The report is many short prints; collect them in memory and write the
+# whole report to stdout in one call at exit (also after exit(1) or an error)
+report = io.StringIO()
+print = functools.partial(print, file=report)
+atexit.register(lambda: sys.stdout.write(report.getvalue()))
+
+
+def code_crosstab(rows, cols, dropna=True):
+    """Count table of two categorical Series, tallied from their codes.
+
+    With dropna=False, missing values on either side are counted under a
+    trailing NaN row or column, as pd.crosstab(..., dropna=False) does.
+    """
+    row_codes = rows.cat.codes.to_numpy()
+    col_codes = cols.cat.codes.to_numpy()
+    row_labels = list(rows.cat.categories)
+    col_labels = list(cols.cat.categories)
+    if dropna:
+        keep = (row_codes >= 0) & (col_codes >= 0)
+        row_codes, col_codes = row_codes[keep], col_codes[keep]
+    else:
+        if (row_codes < 0).any():
+            row_codes = np.where(row_codes < 0, len(row_labels), row_codes)
+            row_labels.append(np.nan)
+        if (col_codes < 0).any():
+            col_codes = np.where(col_codes < 0, len(col_labels), col_codes)
+            col_labels.append(np.nan)
+    n_rows, n_cols = len(row_labels), len(col_labels)
+    counts = np.bincount(row_codes.astype(np.intp) * n_cols + col_codes,
+                         minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+    return pd.DataFrame(counts,
+                        index=pd.Index(row_labels, name=rows.name),
+                        columns=pd.Index(col_labels, name=cols.name))
+
+
 print("=" * 80)
 print("PALMER PENGUINS DATASET - EXPLORATORY DATA ANALYSIS")
 print("=" * 80)
@@ -31,7 +70,7 @@ print()
 print("1. LOADING DATASET")
 print("-" * 40)
 try:
-    df = pd.read_csv('penguins.csv')
+    df = load_penguins()
     print(f"✓ Dataset loaded successfully")
     print(f"✓ Dataset shape: {df.shape[0]} rows × {df.shape[1]} columns")
     print()
@@ -57,8 +96,12 @@ print()
 # Missing values analysis
 print("3. MISSING VALUES ANALYSIS")
 print("-" * 40)
-missing_counts = df.isnull().sum()
-missing_percentages = (df.isnull().sum() / len(df)) * 100
+# Null mask is computed once and reused by the quality checks below
+null_mask = df.isnull()
+missing_counts = null_mask.sum()
+has_missing = bool(null_mask.values.any())
+row_has_missing = null_mask.any(axis=1)
+missing_percentages = (missing_counts / len(df)) * 100
 
 missing_summary = pd.DataFrame({
     'Missing Count': missing_counts,
@@ -69,9 +112,9 @@ print("Missing values by column:")
 print(missing_summary)
 print()
 
-if missing_counts.sum() > 0:
+if has_missing:
     print("Rows with any missing values:")
-    rows_with_missing = df[df.isnull().any(axis=1)]
+    rows_with_missing = df.loc[row_has_missing]
     print(f"Total rows with missing data: {len(rows_with_missing)}")
     print("\nSample rows with missing values:")
     print(rows_with_missing.head(10))
@@ -84,15 +127,19 @@ else:
 print("4. CATEGORICAL VARIABLES ANALYSIS")
 print("-" * 40)
 
-categorical_columns = df.select_dtypes(include=['object']).columns
+categorical_columns = df.select_dtypes(include=['object', 'category']).columns
 print(f"Categorical columns: {list(categorical_columns)}")
 print()
 
+# Counts are kept per column and reused by the species, island and sex
+# sections; the non-null observed entries give the unique count
+category_counts = {}
 for col in categorical_columns:
     print(f"{col.upper()} - Value counts:")
     value_counts = df[col].value_counts(dropna=False)
+    category_counts[col] = value_counts
     print(value_counts)
-    print(f"Unique values: {df[col].nunique()}")
+    print(f"Unique values: {int(((value_counts > 0) & value_counts.index.notna()).sum())}")
     print()
 
 # Numerical variables analysis
@@ -107,26 +154,38 @@ print("Descriptive statistics for numerical variables:")
 print(df[numerical_columns].describe())
 print()
 
-# Detailed statistics for each numerical variable
+# Detailed statistics for each numerical variable, computed for all
+# columns at once and only formatted per column
+numerical_df = df[numerical_columns]
+summary = numerical_df.agg(['count', 'mean', 'median', 'std', 'var', 'skew', 'kurt', 'min', 'max'])
+quartiles = numerical_df.quantile([0.25, 0.75])
+modes = numerical_df.mode()
+
 for col in numerical_columns:
     print(f"{col.upper()} - Detailed statistics:")
-    series = df[col].dropna()
+    col_stats = summary[col]
+    q1, q3 = quartiles.at[0.25, col], quartiles.at[0.75, col]
+    mode = modes[col].iloc[0] if not modes.empty else np.nan
+    # The summary frames are float64 for every column; min, max and mode are
+    # cast back so integer columns still print as integers
+    col_type = numerical_df[col].dtype.type
+    col_min, col_max = col_type(col_stats['min']), col_type(col_stats['max'])
     
     stats = {
-        'Count': len(series),
-        'Mean': series.mean(),
-        'Median': series.median(),
-        'Mode': series.mode().iloc[0] if not series.mode().empty else 'No mode',
-        'Standard Deviation': series.std(),
-        'Variance': series.var(),
-        'Skewness': series.skew(),
-        'Kurtosis': series.kurtosis(),
-        'Min': series.min(),
-        'Max': series.max(),
-        'Range': series.max() - series.min(),
-        'Q1 (25%)': series.quantile(0.25),
-        'Q3 (75%)': series.quantile(0.75),
-        'IQR': series.quantile(0.75) - series.quantile(0.25)
+        'Count': int(col_stats['count']),
+        'Mean': col_stats['mean'],
+        'Median': col_stats['median'],
+        'Mode': col_type(mode) if pd.notna(mode) else 'No mode',
+        'Standard Deviation': col_stats['std'],
+        'Variance': col_stats['var'],
+        'Skewness': col_stats['skew'],
+        'Kurtosis': col_stats['kurt'],
+        'Min': col_min,
+        'Max': col_max,
+        'Range': col_max - col_min,
+        'Q1 (25%)': q1,
+        'Q3 (75%)': q3,
+        'IQR': q3 - q1
     }
     
     for stat, value in stats.items():
@@ -140,45 +199,53 @@ for col in numerical_columns:
 print("6. OUTLIER DETECTION")
 print("-" * 40)
 
+# Bounds reuse the quartiles from section 5; one mask covers every column
+IQR = quartiles.loc[0.75] - quartiles.loc[0.25]
+lower_bounds = quartiles.loc[0.25] - 1.5 * IQR
+upper_bounds = quartiles.loc[0.75] + 1.5 * IQR
+outlier_mask = numerical_df.lt(lower_bounds) | numerical_df.gt(upper_bounds)
+
 for col in numerical_columns:
-    series = df[col].dropna()
-    Q1 = series.quantile(0.25)
-    Q3 = series.quantile(0.75)
-    IQR = Q3 - Q1
-    lower_bound = Q1 - 1.5 * IQR
-    upper_bound = Q3 + 1.5 * IQR
-    
-    outliers = series[(series < lower_bound) | (series > upper_bound)]
+    lower_bound, upper_bound = lower_bounds[col], upper_bounds[col]
+    outliers = numerical_df.loc[outlier_mask[col], col]
     
     print(f"{col.upper()}:")
     print(f"  IQR bounds: [{lower_bound:.2f}, {upper_bound:.2f}]")
     print(f"  Number of outliers: {len(outliers)}")
     if len(outliers) > 0:
-        print(f"  Outlier values: {sorted(outliers.values)}")
+        print(f"  Outlier values: {np.sort(outliers.to_numpy()).tolist()}")
     print()
 
 # Correlation analysis
 print("7. CORRELATION ANALYSIS")
 print("-" * 40)
 
-correlation_matrix = df[numerical_columns].corr()
+corr_matrix = correlation_matrix(df, numerical_columns)
 print("Correlation matrix:")
-print(correlation_matrix.round(3))
+print(corr_matrix.round(3))
 print()
 
-# Find strongest correlations
-correlations = []
-for i in range(len(correlation_matrix.columns)):
-    for j in range(i+1, len(correlation_matrix.columns)):
-        col1 = correlation_matrix.columns[i]
-        col2 = correlation_matrix.columns[j]
-        corr_value = correlation_matrix.iloc[i, j]
-        correlations.append((col1, col2, corr_value))
-
-correlations.sort(key=lambda x: abs(x[2]), reverse=True)
+# Find strongest correlations: pick the top 5 upper-triangle entries by
+# absolute value without sorting every pair
+corr_values = corr_matrix.to_numpy()
+rows, cols = np.triu_indices(len(corr_values), k=1)
+pair_values = corr_values[rows, cols]
+# NaN correlations rank last
+abs_values = np.nan_to_num(np.abs(pair_values), nan=-np.inf)
+k = min(5, pair_values.size)
+if k:
+    # Keep every pair tied with the k-th largest value, in upper-triangle
+    # order, so the stable sort settles ties exactly as a full sort would
+    kth_value = np.partition(abs_values, -k)[-k]
+    top = np.flatnonzero(abs_values >= kth_value)
+    top = top[np.argsort(-abs_values[top], kind='stable')][:k]
+else:
+    top = np.array([], dtype=int)
+names = corr_matrix.columns
+correlations = [(names[rows[t]], names[cols[t]], pair_values[t]) for t in top]
 
 print("Strongest correlations (absolute value):")
-for col1, col2, corr in correlations[:5]:
+for col1, col2, corr in correlations:
     print(f"  {col1} ↔ {col2}: {corr:.3f}")
 print()
 
@@ -187,18 +254,21 @@ print("8. SPECIES-SPECIFIC ANALYSIS")
 print("-" * 40)
 
 if 'species' in df.columns:
-    species_counts = df['species'].value_counts()
+    species_counts = category_counts['species'].loc[lambda s: s.index.notna()]
     print("Species distribution:")
     print(species_counts)
     print()
     
+    # Mean and std come from one grouped aggregation
+    species_agg = df.groupby('species', sort=False, observed=True)[numerical_columns].agg(['mean', 'std'])
+    
     print("Average measurements by species:")
-    species_stats = df.groupby('species')[numerical_columns].mean()
+    species_stats = species_agg.xs('mean', axis=1, level=1)
     print(species_stats.round(2))
     print()
     
     print("Standard deviation by species:")
-    species_std = df.groupby('species')[numerical_columns].std()
+    species_std = species_agg.xs('std', axis=1, level=1)
     print(species_std.round(2))
     print()
 
@@ -207,14 +277,14 @@ print("9. ISLAND ANALYSIS")
 print("-" * 40)
 
 if 'island' in df.columns:
-    island_counts = df['island'].value_counts()
+    island_counts = category_counts['island'].loc[lambda s: s.index.notna()]
     print("Island distribution:")
     print(island_counts)
     print()
     
     if 'species' in df.columns:
         print("Species by island:")
-        species_island = pd.crosstab(df['species'], df['island'])
+        species_island = code_crosstab(df['species'], df['island'])
         print(species_island)
         print()
 
@@ -223,20 +293,20 @@ print("10. SEX ANALYSIS")
 print("-" * 40)
 
 if 'sex' in df.columns:
-    sex_counts = df['sex'].value_counts(dropna=False)
+    sex_counts = category_counts['sex']
     print("Sex distribution:")
     print(sex_counts)
     print()
     
     if 'species' in df.columns:
         print("Sex distribution by species:")
-        sex_species = pd.crosstab(df['species'], df['sex'], dropna=False)
+        sex_species = code_crosstab(df['species'], df['sex'], dropna=False)
         print(sex_species)
         print()
     
     # Sexual dimorphism analysis
     print("Average measurements by sex:")
-    sex_stats = df.groupby('sex')[numerical_columns].mean()
+    sex_stats = df.groupby('sex', observed=True)[numerical_columns].mean()
     print(sex_stats.round(2))
     print()
 
@@ -245,39 +315,44 @@ print("11. DATA QUALITY ASSESSMENT")
 print("-" * 40)
 
 total_cells = df.shape[0] * df.shape[1]
-missing_cells = df.isnull().sum().sum()
+missing_cells = int(null_mask.values.sum())
 completeness = ((total_cells - missing_cells) / total_cells) * 100
 
 print(f"Overall data completeness: {completeness:.1f}%")
 print(f"Total observations: {df.shape[0]}")
-print(f"Complete observations (no missing values): {df.dropna().shape[0]}")
+complete_rows = int((~row_has_missing).sum())
+print(f"Complete observations (no missing values): {complete_rows}")
 print()
 
 # Identify potential data issues
 print("Potential data quality issues:")
 issues = []
 
-# Check for duplicate rows
-duplicates = df.duplicated().sum()
-if duplicates > 0:
+# Check for duplicate rows; the count is only needed when there are any
+duplicate_mask = df.duplicated()
+if duplicate_mask.any():
+    duplicates = int(duplicate_mask.sum())
     issues.append(f"• {duplicates} duplicate rows found")
 
+# Negative and extreme value counts for all columns in one pass over the
+# numeric block; the extreme threshold reuses Q3 from section 5 (NaN never
+# compares true, so missing values and all-missing columns count as zero)
+numerical_values = numerical_df.to_numpy()
+extreme_thresholds = quartiles.loc[0.75].to_numpy() * 3  # Values 3x the Q3 might be suspicious
+negative_counts = (numerical_values < 0).sum(axis=0)
+# Only physical measurements (lengths and masses) can be impossible when negative
+measurement_mask = np.asarray(numerical_columns.str.contains('mm|mass', regex=True))
+extreme_counts = (numerical_values > extreme_thresholds).sum(axis=0)
+
 # Check for impossible values (negative measurements)
-for col in numerical_columns:
-    if 'mm' in col or 'mass' in col:
-        negative_values = (df[col] < 0).sum()
-        if negative_values > 0:
-            issues.append(f"• {negative_values} negative values in {col}")
+for col, negative_values in zip(numerical_columns[measurement_mask], negative_counts[measurement_mask]):
+    if negative_values > 0:
+        issues.append(f"• {negative_values} negative values in {col}")
 
 # Check for extremely high values that might be data entry errors
-for col in numerical_columns:
-    series = df[col].dropna()
-    if len(series) > 0:
-        Q3 = series.quantile(0.75)
-        extreme_threshold = Q3 * 3  # Values 3x the Q3 might be suspicious
-        extreme_values = (series > extreme_threshold).sum()
-        if extreme_values > 0:
-            issues.append(f"• {extreme_values} extremely high values in {col} (>{extreme_threshold:.1f})")
+for col, extreme_values, extreme_threshold in zip(numerical_columns, extreme_counts, extreme_thresholds):
+    if extreme_values > 0:
+        issues.append(f"• {extreme_values} extremely high values in {col} (>{extreme_threshold:.1f})")
 
 if issues:
     for issue in issues:
@@ -294,10 +369,10 @@ print("-" * 40)
 print("KEY FINDINGS:")
 print("• Dataset contains biological measurements of penguins from Palmer Archipelago")
 print(f"• {df.shape[0]} observations across {df.shape[1]} variables")
-print(f"• {df['species'].nunique() if 'species' in df.columns else 'Unknown'} penguin species represented")
+print(f"• {len(df['species'].cat.categories) if 'species' in df.columns else 'Unknown'} penguin species represented")
 print(f"• Data completeness: {completeness:.1f}%")
 
-if missing_counts.sum() > 0:
+if has_missing:
     print(f"• Missing data present in {(missing_counts > 0).sum()} columns")
 
 print()
@@ -318,7 +393,7 @@ print("• Violin plots showing distribution differences by sex and species")
 
 print()
 print("DATA CLEANING RECOMMENDATIONS:")
-if missing_counts.sum() > 0:
+if has_missing:
     print("• Decide on strategy for missing values (imputation vs. removal)")
     print("• Investigate patterns in missing data")
 else: